@@ -1,17 +1,195 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QSlider, QHBoxLayout, QMessageBox
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer, QThread, QObject, QSignalBlocker
+import matplotlib as mpl
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
+from matplotlib.ticker import MaxNLocator, ScalarFormatter
 import numpy as np
 import datetime
 import logging
+import threading
+from collections import OrderedDict
 from database import Database
 
+_SERIES_CACHE_SIZE = 8
+# Above this many points markers overlap and dominate draw time, so only the line is drawn
+_MARKER_POINT_LIMIT = 2000
+# Antialiasing a dense trace costs more in Agg than it gains visually; rasterized keeps
+# exported vector figures from carrying every vertex
+_FREQUENCY_LINE_STYLE = {"color": 'b', "linestyle": '-', "antialiased": False, "rasterized": True}
+# Let Agg merge near-collinear segments (up to a pixel of deviation) and render long paths in chunks;
+# applied around this canvas's draws only, so other figures keep the global defaults
+_FREQUENCY_RC = {'path.simplify': True, 'path.simplify_threshold': 1.0, 'agg.path.chunksize': 10000}
+_CROSSHAIR_STYLE = {"color": 'red', "linestyle": '--', "linewidth": 1}
+# Raw tacho counts to frequency, as TimeView converts its tacho channel: counts * 3.3/65535 to volts, then * 10
+_TACHO_FREQUENCY_SCALE = 3.3 / 65535 * 10
+_series_cache = OrderedDict()
+_series_cache_lock = threading.Lock()
+
+
+class FrequencyRecords:
+    """A file's frequency series as parallel arrays sorted by frameIndex."""
+    __slots__ = ('frame_indices', 'frequencies', 'created_at')
+
+    def __init__(self, frame_indices, frequencies, created_at):
+        self.frame_indices = frame_indices
+        self.frequencies = frequencies
+        # Original createdAt values, handed on unchanged in the selection payload
+        self.created_at = created_at
+        # Shared between plots of the same file through the series cache
+        for array in (frame_indices, frequencies, created_at):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.frame_indices)
+
+    def record(self, i):
+        # Dict view of one frame for callers that work with history documents
+        return {
+            "frameIndex": int(self.frame_indices[i]),
+            "messageFrequency": float(self.frequencies[i]),
+            "createdAt": self.created_at[i]
+        }
+
+
+class FrequencyCanvas(FigureCanvas):
+    def draw(self):
+        # Paths are rebuilt and rendered inside draw, which is where these settings are read
+        with mpl.rc_context(_FREQUENCY_RC):
+            super().draw()
+
+
+def _load_series(db, project_name, model_name, filename, email):
+    """Return the FrequencyRecords of a file, reusing the cached result while the file's
+    document count and last frameIndex are unchanged."""
+    key = (project_name, model_name, filename, email)
+    signature = db.get_history_signature(project_name, model_name, filename=filename)
+    with _series_cache_lock:
+        cached = _series_cache.get(key)
+        if signature is not None and cached is not None and cached[0] == signature:
+            _series_cache.move_to_end(key)
+            logging.debug(f"Using cached frequency series for {filename}")
+            return cached[1]
+
+    # Stream the cursor into buffers sized from the signature's document count, doubling if it grew meanwhile
+    capacity = max(signature[0] if signature else 0, 1024)
+    frame_idx = np.empty(capacity, dtype=np.int64)
+    freqs = np.empty(capacity, dtype=np.float32)
+    tacho_means = np.empty(capacity, dtype=np.float64)
+    created_at_raw = np.empty(capacity, dtype=object)
+    count = 0
+    # Errors propagate to FrequencyPlotWorker.run, so a partial stream is never cached
+    for doc in db.iter_frequency_series(project_name, model_name, filename=filename):
+        if count == capacity:
+            capacity *= 2
+            frame_idx, freqs, tacho_means, created_at_raw = (
+                _grow(buf, capacity) for buf in (frame_idx, freqs, tacho_means, created_at_raw)
+            )
+        frame_idx[count] = doc.get("frameIndex") or 0
+        freqs[count] = np.nan if doc.get("messageFrequency") is None else doc["messageFrequency"]
+        tacho_means[count] = np.nan if doc.get("tachoMean") is None else doc["tachoMean"]
+        created_at_raw[count] = doc.get("createdAt")
+        count += 1
+    if not count:
+        return None
+
+    freqs = freqs[:count]
+    _fill_tacho_frequencies(freqs, tacho_means[:count])
+
+    # Series arrives sorted by frameIndex; only drop rows without a frequency
+    valid = np.flatnonzero(~np.isnan(freqs))
+    series = FrequencyRecords(frame_idx[valid], freqs[valid], created_at_raw[valid])
+
+    if signature is not None:
+        with _series_cache_lock:
+            _series_cache[key] = (signature, series)
+            _series_cache.move_to_end(key)
+            while len(_series_cache) > _SERIES_CACHE_SIZE:
+                _series_cache.popitem(last=False)
+    return series
+
+
+def _grow(buf, capacity):
+    grown = np.empty(capacity, dtype=buf.dtype)
+    grown[:len(buf)] = buf
+    return grown
+
+
+def _fill_tacho_frequencies(freqs, tacho_means):
+    """Fill missing frequencies in place from each frame's mean tacho value."""
+    missing = np.isnan(freqs)
+    freqs[missing] = tacho_means[missing] * _TACHO_FREQUENCY_SCALE
+
+
+def _m4_downsample(x, y, width):
+    """Reduce a series sorted by x to the first, min, max and last point of each
+    pixel column, which renders identically to the full series at that width."""
+    n = len(x)
+    if width <= 0 or n <= 4 * width or x[-1] <= x[0]:
+        return x, y
+    cols = ((x - x[0]) * (width / (x[-1] - x[0]))).astype(np.int64)
+    np.minimum(cols, width - 1, out=cols)
+    starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    # Ordering by (column, value) puts each column's min at its start and max at its end
+    by_value = np.lexsort((y, cols))
+    keep = np.unique(np.concatenate((starts, ends, by_value[starts], by_value[ends])))
+    return x[keep], y[keep]
+
+
+class FrequencyPlotWorker(QObject):
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+    loaded = pyqtSignal(object)
+
+    def __init__(self, db, project_name, model_name, filename, email):
+        super().__init__()
+        # The dashboard's Database; MongoClient is thread-safe, so its pool is shared with this thread
+        self.db = db
+        self.project_name = project_name
+        self.model_name = model_name
+        self.filename = filename
+        self.email = email
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            series = _load_series(self.db, self.project_name, self.model_name, self.filename, self.email)
+            self.loaded.emit(series)
+        except Exception as e:
+            logging.error(f"Error loading frequency data for {self.filename}: {str(e)}")
+            self.error.emit(str(e))
+        finally:
+            self.finished.emit()
+
+
+class FrequencyDecimationWorker(QObject):
+    finished = pyqtSignal()
+    decimated = pyqtSignal(object, object)
+
+    def __init__(self, x, y, width):
+        super().__init__()
+        # Read-only views of the cached series; nothing is copied to hand them over
+        self.x = x
+        self.y = y
+        self.width = width
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            plot_x, plot_y = _m4_downsample(self.x, self.y, self.width)
+            self.decimated.emit(plot_x, plot_y)
+        except Exception as e:
+            logging.error(f"Error decimating frequency data: {str(e)}")
+        finally:
+            self.finished.emit()
+
+
 class FrequencyPlot(QWidget):
     time_range_selected = pyqtSignal(dict)
 
-    def __init__(self, parent=None, project_name=None, model_name=None, filename=None, start_time=None, end_time=None, email="user@example.com"):
+    def __init__(self, parent=None, project_name=None, model_name=None, filename=None, start_time=None, end_time=None, email="user@example.com", db=None):
         super().__init__(parent)
         self.setMinimumSize(800, 600)
         self.project_name = project_name
@@ -20,21 +198,42 @@ class FrequencyPlot(QWidget):
         self.start_time = self.parse_time(start_time) if start_time else None
         self.end_time = self.parse_time(end_time) if end_time else None
         self.email = email
-        self.db = Database(connection_string="mongodb://localhost:27017/", email=email)
+        self.db = db
+        self.load_thread = None
+        self.load_worker = None
 
-        self.current_records = []
-        self.filtered_records = []
+        self.records = None
+        # Selected window as a [lo, hi) slice of the records
+        self.filtered_range = (0, 0)
         self.lower_time_percentage = 0
         self.upper_time_percentage = 100
-        self.time_data = None
-        self.frequency_data = None
+        self.time_data = np.empty(0, dtype=np.int64)
+        self.frequency_data = np.empty(0, dtype=np.float32)
+        self.filtered_frame_indices = self.time_data
+        self.min_frame_index = 0
+        self.max_frame_index = 0
+        self.frame_span = 0
+        # Frame numbers currently shown in the range labels
+        self.label_frames = None
 
         self.selected_record = None
         self.is_crosshair_visible = False
         self.is_crosshair_locked = False
         self.locked_crosshair_position = None
-        self.last_mouse_move = datetime.datetime.now()
-        self.mouse_move_debounce_ms = 50
+        self.pending_mouse_pos = None
+        self.mouse_move_debounce_ms = 16
+        # Axes pixels without the crosshair, captured after every full draw for blitting
+        self.crosshair_background = None
+        # At most one resize decimation runs at a time; newer requests make its result stale
+        self.decimation_thread = None
+        self.decimation_worker = None
+        self.decimation_pending = False
+        self.decimation_suspended = False
+
+        # Coalesces bursts of motion events into at most one crosshair update per interval
+        self.mouse_move_timer = QTimer()
+        self.mouse_move_timer.setSingleShot(True)
+        self.mouse_move_timer.timeout.connect(self.apply_mouse_move)
 
         self.debounce_timer = QTimer()
         self.debounce_timer.setSingleShot(True)
@@ -44,13 +243,13 @@ class FrequencyPlot(QWidget):
         self.is_dragging_range = False
         self.drag_start_x = 0
 
-        self.crosshair_vline = None
-        self.crosshair_hline = None
-
         self.initUI()
         self.initialize_data()
 
     def parse_time(self, time_str):
+        # createdAt stored as a BSON Date already arrives as a datetime
+        if isinstance(time_str, datetime.datetime):
+            return time_str
         try:
             return datetime.datetime.fromisoformat(time_str.replace('Z', '+00:00'))
         except Exception as e:
@@ -66,14 +265,35 @@ class FrequencyPlot(QWidget):
         self.title_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
         self.layout.addWidget(self.title_label)
 
+        self.status_label = QLabel("Loading frequency data...")
+        self.status_label.setStyleSheet("font-size: 14px; color: #666;")
+        self.layout.addWidget(self.status_label)
+
         self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = FrequencyCanvas(self.figure)
         self.ax = self.figure.add_subplot(111)
+        self.frequency_line, = self.ax.plot([], [], label='Frequency', **_FREQUENCY_LINE_STYLE)
+        self.ax.set_xlabel('Frame Index')
+        # Axis formatting is fixed here once: whole-number frame ticks without an offset label
+        self.ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        self.ax.xaxis.set_major_formatter(ScalarFormatter(useOffset=False))
+        self.ax.set_ylabel('Frequency')
+        self.ax.set_title('Frequency vs Frame Index')
+        self.ax.legend()
+        # Crosshair artists are created once and only moved/shown/hidden afterwards; being
+        # animated they are left out of full draws and blitted over the cached background
+        self.crosshair_vline = Line2D([], [], visible=False, animated=True, **_CROSSHAIR_STYLE)
+        self.crosshair_hline = Line2D([], [], visible=False, animated=True, **_CROSSHAIR_STYLE)
+        self.ax.add_line(self.crosshair_vline)
+        self.ax.add_line(self.crosshair_hline)
         self.layout.addWidget(self.canvas)
 
         self.canvas.mpl_connect('motion_notify_event', self.on_mouse_move)
         self.canvas.mpl_connect('button_press_event', self.on_mouse_click)
         self.canvas.mpl_connect('axes_leave_event', self.on_mouse_leave)
+        # The widget has no pan/zoom, so only a resize changes the pixel columns to decimate into
+        self.canvas.mpl_connect('resize_event', self.on_canvas_resize)
+        self.canvas.mpl_connect('draw_event', self.on_canvas_draw)
 
         self.slider_widget = QWidget()
         self.slider_layout = QHBoxLayout()
@@ -89,6 +309,7 @@ class FrequencyPlot(QWidget):
         self.start_slider.setMaximum(100)
         self.start_slider.setValue(0)
         self.start_slider.valueChanged.connect(self.update_labels)
+        self.start_slider.sliderReleased.connect(self.on_slider_released)
         self.slider_layout.addWidget(self.start_slider)
 
         self.end_label = QLabel("End: ")
@@ -100,6 +321,7 @@ class FrequencyPlot(QWidget):
         self.end_slider.setMaximum(100)
         self.end_slider.setValue(100)
         self.end_slider.valueChanged.connect(self.update_labels)
+        self.end_slider.sliderReleased.connect(self.on_slider_released)
         self.slider_layout.addWidget(self.end_slider)
 
         self.layout.addWidget(self.slider_widget)
@@ -127,99 +349,273 @@ class FrequencyPlot(QWidget):
         self.setLayout(self.layout)
 
     def initialize_data(self):
+        # The series fetch runs on a worker thread so the window paints immediately
+        self.load_worker = FrequencyPlotWorker(self.db, self.project_name, self.model_name, self.filename, self.email)
+        self.load_thread = QThread()
+        self.load_worker.moveToThread(self.load_thread)
+        self.load_thread.started.connect(self.load_worker.run)
+        self.load_worker.finished.connect(self.load_thread.quit)
+        self.load_worker.finished.connect(self.load_worker.deleteLater)
+        self.load_thread.finished.connect(self.load_thread.deleteLater)
+        self.load_thread.finished.connect(self.on_load_finished)
+        self.load_worker.error.connect(self.on_data_load_error)
+        self.load_worker.loaded.connect(self.complete_initialization)
+        self.load_thread.start()
+
+    @pyqtSlot()
+    def on_load_finished(self):
+        self.load_thread = None
+        self.load_worker = None
+
+    def cleanup(self):
+        # Called before the window is deleted: results must not reach a dead widget and no
+        # QThread may be destroyed while it is still running
+        self.mouse_move_timer.stop()
+        self.debounce_timer.stop()
+        if self.load_worker is not None:
+            try:
+                self.load_worker.loaded.disconnect(self.complete_initialization)
+                self.load_worker.error.disconnect(self.on_data_load_error)
+            except (TypeError, RuntimeError):
+                pass
+        if self.load_thread is not None:
+            try:
+                if self.load_thread.isRunning():
+                    self.load_thread.quit()
+                    self.load_thread.wait()
+            except RuntimeError:
+                pass
+            self.load_thread = None
+            self.load_worker = None
+        # No further resize passes; a running one is joined instead of being destroyed mid-run
+        self.decimation_suspended = True
+        self.decimation_pending = False
+        if self.decimation_worker is not None:
+            try:
+                self.decimation_worker.decimated.disconnect(self.apply_decimated)
+            except (TypeError, RuntimeError):
+                pass
+        if self.decimation_thread is not None:
+            try:
+                if self.decimation_thread.isRunning():
+                    self.decimation_thread.quit()
+                    self.decimation_thread.wait()
+            except RuntimeError:
+                pass
+            self.decimation_thread = None
+            self.decimation_worker = None
+
+    def closeEvent(self, event):
+        self.cleanup()
+        super().closeEvent(event)
+
+    @pyqtSlot(str)
+    def on_data_load_error(self, message):
+        self.status_label.setText(f"Error loading frequency data: {message}")
+
+    @pyqtSlot(object)
+    def complete_initialization(self, series):
         try:
-            messages = self.db.get_history_messages(self.project_name, self.model_name, filename=self.filename)
-            if not messages:
+            if series is None:
                 logging.error(f"No history messages found for {self.filename}")
+                self.status_label.setText("No frequency data found for this file.")
                 return
 
-            self.current_records = sorted(messages, key=lambda x: x.get("frameIndex", 0))
-            self.filtered_records = self.current_records.copy()
-
-            self.time_data = [record.get("frameIndex", 0) for record in self.current_records]
-            self.frequency_data = [record.get("messageFrequency", 0) for record in self.current_records]
+            self.records = series
+            self.time_data = series.frame_indices
+            self.frequency_data = series.frequencies
+            self.filtered_range = (0, len(series))
+            self.filtered_frame_indices = self.time_data
 
-            if not self.start_time:
-                first_record = min(self.current_records, key=lambda x: (self.parse_time(x.get("createdAt")) or datetime.datetime.min).timestamp())
-                self.start_time = self.parse_time(first_record.get("createdAt"))
-            if not self.end_time:
-                last_record = max(self.current_records, key=lambda x: (self.parse_time(x.get("createdAt")) or datetime.datetime.min).timestamp())
-                self.end_time = self.parse_time(last_record.get("createdAt"))
+            if not self.records:
+                logging.error(f"No valid frequency data found for {self.filename}")
+                self.status_label.setText("No frequency data found for this file.")
+                return
+            self.status_label.hide()
+            self.min_frame_index = int(self.time_data[0])
+            self.max_frame_index = int(self.time_data[-1])
+            self.frame_span = max(self.max_frame_index - self.min_frame_index, 0)
 
+            self.plot_series()
             self.filter_and_plot_data()
         except Exception as e:
             logging.error(f"Error initializing: {str(e)}")
 
+    @pyqtSlot()
     def filter_and_plot_data(self):
         try:
-            if not self.current_records:
+            if not self.records:
                 return
 
-            all_frame_indices = [r.get("frameIndex", 0) for r in self.current_records]
-            min_frame = min(all_frame_indices)
-            max_frame = max(all_frame_indices)
+            min_frame = self.min_frame_index
+            max_frame = self.max_frame_index
             frame_range = max_frame - min_frame if max_frame > min_frame else 1
             lower_frame = min_frame + (frame_range * self.lower_time_percentage / 100.0)
             upper_frame = min_frame + (frame_range * self.upper_time_percentage / 100.0)
 
-            self.filtered_records = [record for record in self.current_records if lower_frame <= record.get("frameIndex", 0) <= upper_frame]
+            # time_data is sorted, so the selected window is one contiguous slice
+            lo = int(np.searchsorted(self.time_data, lower_frame, side='left'))
+            hi = int(np.searchsorted(self.time_data, upper_frame, side='right'))
+            self.filtered_range = (lo, hi)
+            self.filtered_frame_indices = self.time_data[lo:hi]
 
-            self.time_data = [record.get("frameIndex", 0) for record in self.current_records]
-            self.frequency_data = [record.get("messageFrequency", 0) for record in self.current_records]
+            # The plot always shows the full series, so a range change needs no redraw
+            logging.debug(f"Filtered {hi - lo} of {len(self.records)} records")
+        except Exception as e:
+            logging.error(f"Error filtering and plotting: {str(e)}")
 
-            self.ax.clear()
-            self.ax.plot(self.time_data, self.frequency_data, marker='o', linestyle='-', color='b', label='Frequency')
-            self.ax.set_xlabel('Frame Index')
-            self.ax.set_ylabel('Frequency')
-            self.ax.set_title('Frequency vs Frame Index')
-            self.ax.legend()
+    def decimate_visible(self):
+        # Only the points inside the current x limits (plus one neighbour each side so the
+        # line still reaches the edges) are reduced to at most ~4 points per pixel column
+        if len(self.time_data) == 0 or self.decimation_suspended:
+            return
+        if self.decimation_thread is not None:
+            # Picked up with the latest limits once the running pass finishes
+            self.decimation_pending = True
+            return
+        x_min, x_max = self.ax.get_xlim()
+        lo = max(int(np.searchsorted(self.time_data, x_min, side='left')) - 1, 0)
+        hi = min(int(np.searchsorted(self.time_data, x_max, side='right')) + 1, len(self.time_data))
+        width = int(self.ax.bbox.width)
+        if hi - lo <= 4 * width:
+            # Nothing to reduce; the visible points are drawn as they are
+            self.frequency_line.set_data(self.time_data[lo:hi], self.frequency_data[lo:hi])
+            return
+        self.decimation_worker = FrequencyDecimationWorker(self.time_data[lo:hi], self.frequency_data[lo:hi], width)
+        self.decimation_thread = QThread()
+        self.decimation_worker.moveToThread(self.decimation_thread)
+        self.decimation_thread.started.connect(self.decimation_worker.run)
+        self.decimation_worker.finished.connect(self.decimation_thread.quit)
+        self.decimation_worker.finished.connect(self.decimation_worker.deleteLater)
+        self.decimation_thread.finished.connect(self.decimation_thread.deleteLater)
+        self.decimation_thread.finished.connect(self.on_decimation_finished)
+        self.decimation_worker.decimated.connect(self.apply_decimated)
+        self.decimation_thread.start()
+
+    @pyqtSlot(object, object)
+    def apply_decimated(self, plot_x, plot_y):
+        # A result computed for limits that have since changed is dropped
+        if self.decimation_pending:
+            return
+        self.frequency_line.set_data(plot_x, plot_y)
+        self.canvas.draw_idle()
+
+    @pyqtSlot()
+    def on_decimation_finished(self):
+        self.decimation_thread = None
+        self.decimation_worker = None
+        if self.decimation_pending:
+            self.decimation_pending = False
+            self.decimate_visible()
+
+    def on_canvas_resize(self, event):
+        self.crosshair_background = None
+        self.decimate_visible()
+
+    def on_canvas_draw(self, event):
+        # A full draw just finished: cache the crosshair-free axes and paint the crosshair on top
+        self.crosshair_background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.draw_crosshair_artists()
+
+    def draw_crosshair_artists(self):
+        for line in (self.crosshair_vline, self.crosshair_hline):
+            if line.get_visible():
+                self.ax.draw_artist(line)
+
+    def blit_crosshair(self):
+        if self.crosshair_background is None:
+            # Nothing cached yet (first paint or after a resize); the full draw repaints the crosshair
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.crosshair_background)
+        self.draw_crosshair_artists()
+        self.canvas.blit(self.ax.bbox)
+
+    def plot_series(self):
+        try:
+            # Decimated over the full span so relim still sees the true x/y extents
+            plot_x, plot_y = _m4_downsample(self.time_data, self.frequency_data, int(self.ax.bbox.width))
+
+            # Limits are computed once per dataset; crosshair lines must not take part in autoscaling
+            self.remove_crosshair(redraw=False)
+            # The line changed, so the cached background is stale until the next full draw
+            self.crosshair_background = None
+            if self.decimation_thread is not None:
+                # Whatever is in flight was computed for the previous data
+                self.decimation_pending = True
+            self.frequency_line.set_data(plot_x, plot_y)
+            marker = 'o' if len(self.time_data) <= _MARKER_POINT_LIMIT else ''
+            if self.frequency_line.get_marker() != marker:
+                self.frequency_line.set_marker(marker)
+            self.ax.relim(visible_only=True)
+            self.ax.autoscale_view()
 
             # If crosshair was locked previously, re-draw at the locked position
             if self.is_crosshair_locked and self.locked_crosshair_position is not None:
                 x, y = self.locked_crosshair_position
-                self.draw_crosshair(x, y, force=True)
+                self.draw_crosshair(x, y, force=True, redraw=False)
 
-            self.canvas.draw()
-            logging.debug(f"Plotted {len(self.current_records)} data points")
+            self.canvas.draw_idle()
+            logging.debug(f"Plotted {len(plot_x)} of {len(self.records)} data points")
         except Exception as e:
-            logging.error(f"Error filtering and plotting: {str(e)}")
+            logging.error(f"Error plotting frequency data: {str(e)}")
 
+    @pyqtSlot()
     def update_labels(self):
-        self.lower_time_percentage = self.start_slider.value()
-        self.upper_time_percentage = self.end_slider.value()
-        if self.current_records:
-            all_frame_indices = [r.get("frameIndex", 0) for r in self.current_records]
-            min_frame = min(all_frame_indices)
-            max_frame = max(all_frame_indices)
-            frame_range = max(max_frame - min_frame, 0)
-            lower_frame = int(min_frame + (frame_range * self.lower_time_percentage / 100.0))
-            upper_frame = int(min_frame + (frame_range * self.upper_time_percentage / 100.0))
-            self.start_label.setText(f"Start: {lower_frame}")
-            self.end_label.setText(f"End: {upper_frame}")
-        else:
-            self.start_label.setText("Start: 0")
-            self.end_label.setText("End: 0")
+        lower, upper = self.start_slider.value(), self.end_slider.value()
+        if lower == self.lower_time_percentage and upper == self.upper_time_percentage:
+            return
+        self.lower_time_percentage = lower
+        self.upper_time_percentage = upper
+        self.refresh_range_labels()
+        # While a handle is being dragged only the labels follow; the range is committed on release
+        if self.start_slider.isSliderDown() or self.end_slider.isSliderDown():
+            return
         self.debounce_timer.start(self.debounce_delay)
 
+    def refresh_range_labels(self):
+        if self.records:
+            lower_frame = int(self.min_frame_index + (self.frame_span * self.lower_time_percentage / 100.0))
+            upper_frame = int(self.min_frame_index + (self.frame_span * self.upper_time_percentage / 100.0))
+        else:
+            lower_frame = upper_frame = 0
+        # Several slider steps map to the same frame on short files; only relabel when the text would change
+        if (lower_frame, upper_frame) == self.label_frames:
+            return
+        self.label_frames = (lower_frame, upper_frame)
+        self.start_label.setText(f"Start: {lower_frame}")
+        self.end_label.setText(f"End: {upper_frame}")
+
+    @pyqtSlot()
+    def on_slider_released(self):
+        self.debounce_timer.stop()
+        self.filter_and_plot_data()
+
     def on_mouse_move(self, event):
         if not event.inaxes:
             return
-        now = datetime.datetime.now()
-        if (now - self.last_mouse_move).total_seconds() * 1000 < self.mouse_move_debounce_ms:
+        self.pending_mouse_pos = (event.xdata, event.ydata)
+        if not self.mouse_move_timer.isActive():
+            self.mouse_move_timer.start(self.mouse_move_debounce_ms)
+
+    @pyqtSlot()
+    def apply_mouse_move(self):
+        if self.pending_mouse_pos is None:
             return
-        self.last_mouse_move = now
+        xdata, ydata = self.pending_mouse_pos
+        self.pending_mouse_pos = None
 
         if not self.is_crosshair_locked:
-            if event.xdata is None or event.ydata is None:
+            if xdata is None or ydata is None:
                 return
             self.is_crosshair_visible = True
-            self.draw_crosshair(event.xdata, event.ydata)
+            self.draw_crosshair(xdata, ydata)
         elif self.is_crosshair_locked and self.locked_crosshair_position is not None:
             x, y = self.locked_crosshair_position
             self.draw_crosshair(x, y)
 
-        if self.is_dragging_range and event.xdata is not None:
-            self.update_range_on_drag(event.xdata)
+        if self.is_dragging_range and xdata is not None:
+            self.update_range_on_drag(xdata)
 
     def on_mouse_click(self, event):
         if not event.inaxes:
@@ -240,11 +636,13 @@ class FrequencyPlot(QWidget):
             logging.debug("Crosshair unlocked")
 
     def on_mouse_leave(self, event):
+        self.mouse_move_timer.stop()
+        self.pending_mouse_pos = None
         if not self.is_crosshair_locked:
             self.is_crosshair_visible = False
             self.remove_crosshair()
 
-    def draw_crosshair(self, x, y, force=False):
+    def draw_crosshair(self, x, y, force=False, redraw=True):
         # Validate inputs
         if x is None or y is None:
             return
@@ -253,15 +651,6 @@ class FrequencyPlot(QWidget):
         if not force and not self.is_crosshair_visible and not self.is_crosshair_locked:
             return
 
-        # Remove existing crosshair lines if present
-        try:
-            if self.crosshair_vline is not None and self.crosshair_vline in self.ax.lines:
-                self.crosshair_vline.remove()
-            if self.crosshair_hline is not None and self.crosshair_hline in self.ax.lines:
-                self.crosshair_hline.remove()
-        except Exception:
-            pass
-
         # Get numeric axis limits
         try:
             y0, y1 = self.ax.get_ylim()
@@ -271,37 +660,28 @@ class FrequencyPlot(QWidget):
         except Exception:
             return
 
-        # Build fresh Line2D objects with simple float arrays
-        self.crosshair_vline = Line2D([float(x), float(x)], [y0, y1], color='red', linestyle='--', linewidth=1)
-        self.crosshair_hline = Line2D([x0, x1], [float(y), float(y)], color='red', linestyle='--', linewidth=1)
-
-        self.ax.add_line(self.crosshair_vline)
-        self.ax.add_line(self.crosshair_hline)
-        self.canvas.draw_idle()
-
-    def remove_crosshair(self):
-        changed = False
-        try:
-            if self.crosshair_vline is not None and self.crosshair_vline in self.ax.lines:
-                self.crosshair_vline.remove()
-                changed = True
-        except Exception:
-            pass
-        try:
-            if self.crosshair_hline is not None and self.crosshair_hline in self.ax.lines:
-                self.crosshair_hline.remove()
-                changed = True
-        except Exception:
-            pass
-        if changed:
-            self.canvas.draw_idle()
-
+        self.crosshair_vline.set_data([float(x), float(x)], [y0, y1])
+        self.crosshair_hline.set_data([x0, x1], [float(y), float(y)])
+        self.crosshair_vline.set_visible(True)
+        self.crosshair_hline.set_visible(True)
+        if redraw:
+            self.blit_crosshair()
+
+    def remove_crosshair(self, redraw=True):
+        changed = self.crosshair_vline.get_visible() or self.crosshair_hline.get_visible()
+        self.crosshair_vline.set_visible(False)
+        self.crosshair_hline.set_visible(False)
+        if changed and redraw:
+            self.blit_crosshair()
+
+    @pyqtSlot()
     def start_range_drag(self):
         self.is_dragging_range = True
-        if self.time_data:
+        if len(self.time_data):
             span = (self.time_data[-1] - self.time_data[0]) if len(self.time_data) > 1 else 1
-            self.drag_start_x = self.time_data + span * (self.lower_time_percentage / 100.0)
+            self.drag_start_x = self.time_data[0] + span * (self.lower_time_percentage / 100.0)
 
+    @pyqtSlot()
     def stop_range_drag(self):
         self.is_dragging_range = False
 
@@ -311,7 +691,7 @@ class FrequencyPlot(QWidget):
             pass
 
     def update_range_on_drag(self, x):
-        if x is None or not self.time_data:
+        if x is None or not len(self.time_data):
             return
         denom = (self.time_data[-1] - self.time_data[0]) if len(self.time_data) > 1 else 1
         if denom == 0:
@@ -323,44 +703,65 @@ class FrequencyPlot(QWidget):
         if new_lower < new_upper:
             self.lower_time_percentage = new_lower
             self.upper_time_percentage = new_upper
-            self.start_slider.setValue(int(new_lower))
-            self.end_slider.setValue(int(new_upper))
+            # Programmatic slider writes must not feed back through update_labels into the range,
+            # and the slider row repaints once after both handles have moved
+            self.slider_widget.setUpdatesEnabled(False)
+            try:
+                with QSignalBlocker(self.start_slider), QSignalBlocker(self.end_slider):
+                    self.start_slider.setValue(int(new_lower))
+                    self.end_slider.setValue(int(new_upper))
+                self.refresh_range_labels()
+            finally:
+                self.slider_widget.setUpdatesEnabled(True)
             self.filter_and_plot_data()
 
     def find_closest_record(self, selected_frame_index):
         try:
-            if not self.filtered_records:
+            if len(self.filtered_frame_indices) == 0:
                 return None
-            closest_record = min(self.filtered_records, key=lambda r: abs(r.get("frameIndex", 0) - selected_frame_index))
-            if closest_record and closest_record.get("message"):
-                return closest_record
-            # Fallback fetch full record if minimal doc
+            # filtered_frame_indices is sorted, so the nearest frame is one of the two neighbours of the insertion point
+            fi = self.filtered_frame_indices
+            i = int(np.searchsorted(fi, selected_frame_index))
+            if i == len(fi) or (i > 0 and abs(fi[i - 1] - selected_frame_index) <= abs(fi[i] - selected_frame_index)):
+                i -= 1
+            return self.records.record(self.filtered_range[0] + i)
+        except Exception as e:
+            logging.error(f"Error finding closest record: {str(e)}")
+            return None
+
+    def fetch_record_payload(self, frame_index):
+        # Only fetched once a selection is confirmed; the message array dominates the document size
+        try:
             query = {
-                "filename": self.filename,
-                "moduleName": self.model_name,
                 "projectName": self.project_name,
-                "frameIndex": closest_record.get("frameIndex"),
-                "email": self.email
+                "moduleName": self.model_name,
+                "filename": self.filename,
+                "email": self.email,
+                "frameIndex": frame_index
             }
-            full_records = list(self.db.history_collection.find(query))
-            if full_records:
-                return full_records[0]
-            return closest_record
+            return self.db.history_collection.find_one(
+                query,
+                projection={
+                    "_id": 0, "createdAt": 1, "message": 1, "messageDtype": 1,
+                    "numberOfChannels": 1, "tacoChannelCount": 1, "samplingRate": 1, "samplingSize": 1
+                },
+                sort=[("createdAt", -1)]
+            )
         except Exception as e:
-            logging.error(f"Error finding closest record: {str(e)}")
+            logging.error(f"Error fetching record payload for frame {frame_index}: {str(e)}")
             return None
 
     def get_current_frame_index_range(self):
-        if not self.current_records:
+        if not self.records:
             return 0, 0
-        all_frame_indices = [r.get("frameIndex", 0) for r in self.current_records]
-        min_frame = min(all_frame_indices)
-        max_frame = max(all_frame_indices)
+        min_frame = self.min_frame_index
+        max_frame = self.max_frame_index
         frame_range = max_frame - min_frame
         start_frame_index = int(min_frame + (frame_range * self.lower_time_percentage / 100.0)) if frame_range >= 0 else min_frame
         end_frame_index = int(min_frame + (frame_range * self.upper_time_percentage / 100.0)) if frame_range >= 0 else max_frame
         return start_frame_index, end_frame_index
 
+    @pyqtSlot()
     def select_button_click(self):
         try:
             if not self.is_crosshair_locked or not self.locked_crosshair_position:
@@ -379,22 +780,9 @@ class FrequencyPlot(QWidget):
 
             start_frame_index, end_frame_index = self.get_current_frame_index_range()
 
-            selected_data = {
-                "filename": self.filename,
-                "model": self.model_name,
-                "frameIndex": self.selected_record.get("frameIndex"),
-                "timestamp": self.selected_record.get("createdAt"),
-                "channelData": self.selected_record.get("message", []),
-                "project_name": self.project_name,
-                "numberOfChannels": self.selected_record.get("numberOfChannels", 0),
-                "tacoChannelCount": self.selected_record.get("tacoChannelCount", 0),
-                "samplingRate": self.selected_record.get("samplingRate", 0),
-                "samplingSize": self.selected_record.get("samplingSize", 0),
-            }
-
             confirmation_message = (
                 f"Final Confirmation - Range Selection Details:\n\n"
-                f"Selected Frame Index: {selected_data['frameIndex']}\n"
+                f"Selected Frame Index: {self.selected_record.get('frameIndex')}\n"
                 f"Filename: {self.filename}\n"
                 f"Model: {self.model_name}\n"
                 f"Frequency Value: {y:.2f}\n\n"
@@ -407,6 +795,25 @@ class FrequencyPlot(QWidget):
             )
             result = QMessageBox.question(self, "Final Confirmation - Frame Range Information", confirmation_message, QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if result == QMessageBox.Yes:
+                payload = self.fetch_record_payload(self.selected_record.get("frameIndex"))
+                if not payload:
+                    QMessageBox.warning(self, "Warning", "Could not load channel data for the selected frame.")
+                    logging.info(f"No payload found for FrameIndex: {self.selected_record.get('frameIndex')}")
+                    return
+                # Features expect the flattened channel data as a plain list
+                channel_data = Database.decode_message_list(payload)
+                selected_data = {
+                    "filename": self.filename,
+                    "model": self.model_name,
+                    "frameIndex": self.selected_record.get("frameIndex"),
+                    "timestamp": payload.get("createdAt", self.selected_record.get("createdAt")),
+                    "channelData": channel_data or [],
+                    "project_name": self.project_name,
+                    "numberOfChannels": payload.get("numberOfChannels", 0),
+                    "tacoChannelCount": payload.get("tacoChannelCount", 0),
+                    "samplingRate": payload.get("samplingRate", 0),
+                    "samplingSize": payload.get("samplingSize", 0),
+                }
                 self.time_range_selected.emit(selected_data)
                 logging.info(f"Data confirmed for FrameIndex: {selected_data['frameIndex']}, Range: {start_frame_index} to {end_frame_index}")
                 QMessageBox.information(self, "Selection Complete", f"Selection confirmed.\nFrame Index {selected_data['frameIndex']} selected.\nRange: {start_frame_index} to {end_frame_index}\n\nThe frequency plot will now close.")
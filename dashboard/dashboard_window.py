@@ -719,7 +719,8 @@ class DashboardWindow(QWidget):
                 project_name=file_data["project_name"],
                 model_name=file_data["model_name"],
                 filename=file_data["filename"],
-                email=self.email
+                email=self.email,
+                db=self.db
             )
             # Connect selection from FrequencyPlot
             freq_plot.time_range_selected.connect(self.on_frequency_selection)
@@ -821,6 +822,7 @@ class DashboardWindow(QWidget):
                 try:
                     sw = self.sub_windows.get(self._freqplot_key)
                     if sw:
+                        self.release_frequency_plot(sw)
                         if sw.isMaximized():
                             sw.showNormal()
                         sw.close()
@@ -839,6 +841,12 @@ class DashboardWindow(QWidget):
             logging.error(f"Failed to handle frequency selection: {str(e)}")
             self.console.append_to_console(f"Error applying selection: {str(e)}")
 
+    def release_frequency_plot(self, sub_window):
+        # The subwindow's closeEvent is replaced, so a hosted FrequencyPlot never sees a close itself
+        widget = sub_window.widget()
+        if isinstance(widget, FrequencyPlot):
+            widget.cleanup()
+
     def on_subwindow_closed(self, event, key):
         try:
             feature_name, model_name, channel_name, unique_id = key
@@ -875,6 +883,7 @@ class DashboardWindow(QWidget):
                 logging.debug(f"Removed feature instance for {key}")
 
             try:
+                self.release_frequency_plot(sub_window)
                 sub_window.close()
                 self.main_section.mdi_area.removeSubWindow(sub_window)
                 sub_window.setParent(None)
@@ -935,6 +944,7 @@ class DashboardWindow(QWidget):
                 sub_window = self.sub_windows.get(key)
                 if sub_window:
                     try:
+                        self.release_frequency_plot(sub_window)
                         if sub_window.isMaximized():
                             sub_window.showNormal()
                         sub_window.close()
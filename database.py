@@ -1,15 +1,24 @@
 from pymongo import MongoClient, ASCENDING
+from bson.binary import Binary
+from bson.codec_options import CodecOptions
 from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+import numpy as np
 import datetime
 import logging
 import re
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Dtype of binary history payloads; documents without messageDtype hold a BSON array
+MESSAGE_DTYPE = "float32"
+
 class Database:
-    def __init__(self, connection_string="mongodb://localhost:27017/", email="user@example.com"):
+    def __init__(self, connection_string="mongodb://localhost:27017/", email="user@example.com", binary_payloads=False):
         self.connection_string = connection_string
         self.email = email
+        # Opt-in: other clients of the history collection read message as a BSON array
+        self.binary_payloads = binary_payloads
         self.email_safe = email.replace('@', '_').replace('.', '_')
         self.client = None
         self.db = None
@@ -56,12 +65,44 @@ class Database:
             logging.error(f"Failed to reconnect to MongoDB: {str(e)}")
             raise
 
+    @staticmethod
+    def encode_message(message_data, binary=False):
+        message = message_data["message"]
+        if isinstance(message, (bytes, Binary)):
+            return
+        values = np.asarray(message, dtype=MESSAGE_DTYPE)
+        samples_per_channel = message_data.get("samplingSize") or 0
+        # The frequency series reads the raw tacho mean from here, so it never has to ship the payload
+        tacho_start = (message_data.get("numberOfChannels") or 0) * samples_per_channel
+        if (message_data.get("tacoChannelCount") or 0) >= 1 and samples_per_channel and tacho_start + samples_per_channel <= values.size:
+            message_data["tachoMean"] = float(values[tacho_start:tacho_start + samples_per_channel].mean(dtype=np.float64))
+        if binary:
+            # Flattened channel-major payload; its layout is given by numberOfChannels, tacoChannelCount and samplingSize
+            message_data["message"] = Binary(values.tobytes())
+            message_data["messageDtype"] = MESSAGE_DTYPE
+
+    @staticmethod
+    def decode_message(doc):
+        # Returns the flattened payload as a read-only ndarray, or the legacy list unchanged
+        message = doc.get("message")
+        if isinstance(message, (bytes, Binary)):
+            return np.frombuffer(message, dtype=doc.get("messageDtype") or MESSAGE_DTYPE)
+        return message
+
+    @staticmethod
+    def decode_message_list(doc):
+        # For callers that hand the payload on as a plain list
+        message = Database.decode_message(doc)
+        return message.tolist() if isinstance(message, np.ndarray) else message
+
     def _create_history_indexes(self):
         try:
+            # Covers the per-file series fetch and the single-frame lookup by frameIndex
             self.history_collection.create_index([
                 ("projectName", ASCENDING),
                 ("moduleName", ASCENDING),
                 ("filename", ASCENDING),
+                ("email", ASCENDING),
                 ("frameIndex", ASCENDING)
             ])
             logging.info("Indexes created for history collection")
@@ -556,6 +597,7 @@ class Database:
         message_data["email"] = self.email
         message_data["_id"] = ObjectId()
         try:
+            self.encode_message(message_data, binary=self.binary_payloads)
             result = self.history_collection.insert_one(message_data)
             logging.info(f"Saved history message for {message_data['topic']} in {project_name}/{model_name} with filename {message_data['filename']}: {result.inserted_id}")
             return True, "History message saved successfully!"
@@ -563,7 +605,7 @@ class Database:
             logging.error(f"Error saving history message: {str(e)}")
             return False, f"Failed to save history message: {str(e)}"
 
-    def get_history_messages(self, project_name, model_name=None, topic=None, filename=None):
+    def get_history_messages(self, project_name, model_name=None, topic=None, filename=None, projection=None, raw=False, sort_by="createdAt"):
         if not self.get_project_data(project_name):
             logging.error(f"Project {project_name} not found!")
             return []
@@ -574,17 +616,140 @@ class Database:
             query["topic"] = topic
         if filename:
             query["filename"] = filename
+        collection = self.history_collection
+        if raw:
+            # Read-only metadata scans: fields are decoded from the raw BSON only when accessed
+            collection = collection.with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
         try:
-            messages = list(self.history_collection.find(query).sort("createdAt", 1))
+            # sort_by="frameIndex" with the file's equality fields is served by the history index without an in-memory sort
+            messages = list(collection.find(query, projection).sort(sort_by, 1))
             if not messages:
                 logging.debug(f"No history messages found for project {project_name}")
                 return []
+            if not raw:
+                for message in messages:
+                    if "message" in message:
+                        message["message"] = self.decode_message_list(message)
             logging.debug(f"Retrieved {len(messages)} history messages for project {project_name}")
             return messages
         except Exception as e:
             logging.error(f"Error fetching history messages: {str(e)}")
             return []
 
+    def get_messages_bulk(self, project_name, model_name=None, filename=None, ids=None):
+        if not ids:
+            return {}
+        query = {"projectName": project_name, "email": self.email}
+        if model_name:
+            query["moduleName"] = model_name
+        if filename:
+            query["filename"] = filename
+        # One $in round trip for every document instead of a query per document; keyed by _id because
+        # a file can hold several revisions of the same frameIndex
+        query["_id"] = {"$in": list(ids)}
+        try:
+            cursor = self.history_collection.find(query, {"_id": 1, "message": 1, "messageDtype": 1})
+            messages = {doc["_id"]: self.decode_message(doc) for doc in cursor}
+            logging.debug(f"Retrieved {len(messages)} of {len(ids)} message payloads for {filename} in project {project_name}")
+            return messages
+        except Exception as e:
+            # None rather than {}, so a failed fetch is not mistaken for frames without payloads
+            logging.error(f"Error fetching message payloads: {str(e)}")
+            return None
+
+    def get_latest_history_message(self, project_name, model_name=None, filename=None):
+        if not self.get_project_data(project_name):
+            logging.error(f"Project {project_name} not found!")
+            return None
+        query = {"projectName": project_name, "email": self.email}
+        if model_name:
+            query["moduleName"] = model_name
+        if filename:
+            query["filename"] = filename
+        try:
+            # The server keeps only the newest document while sorting, so one document crosses the wire
+            message = self.history_collection.find_one(query, sort=[("createdAt", -1)])
+            if not message:
+                logging.debug(f"No history messages found for {filename} in project {project_name}")
+                return None
+            if "message" in message:
+                message["message"] = self.decode_message_list(message)
+            return message
+        except Exception as e:
+            logging.error(f"Error fetching latest history message: {str(e)}")
+            return None
+
+    def iter_frequency_series(self, project_name, model_name=None, filename=None):
+        # Yields one small document per frameIndex straight off the cursor, so callers never hold the full result
+        if not self.get_project_data(project_name):
+            logging.error(f"Project {project_name} not found!")
+            return
+        match = {"projectName": project_name}
+        if model_name:
+            match["moduleName"] = model_name
+        if filename:
+            match["filename"] = filename
+        match["email"] = self.email
+        # Frames saved without messageFrequency carry only their tacho frequency channel, which
+        # follows the numberOfChannels main channels in the flattened message
+        needs_tacho = {"$and": [
+            {"$eq": [{"$ifNull": ["$messageFrequency", None]}, None]},
+            {"$gte": ["$tacoChannelCount", 1]},
+            {"$gt": ["$samplingSize", 0]}
+        ]}
+        tacho_start = {"$multiply": ["$numberOfChannels", "$samplingSize"]}
+        # Documents saved since tachoMean was added carry it; older array payloads are averaged
+        # on the server. Either way only one raw mean per frame leaves the server
+        tacho_mean = {"$ifNull": ["$tachoMean", {"$cond": [
+            {"$isArray": "$message"},
+            {"$avg": {"$slice": ["$message", tacho_start, "$samplingSize"]}},
+            None
+        ]}]}
+        # Project away the rest of the message payload, keep one document per frameIndex and sort on the server
+        pipeline = [
+            {"$match": match},
+            {"$project": {
+                "_id": 0, "frameIndex": 1, "messageFrequency": 1, "createdAt": 1,
+                "tachoMean": {"$cond": [needs_tacho, tacho_mean, "$$REMOVE"]}
+            }},
+            # Newest revision first within a frameIndex, so $first keeps the document fetch_record_payload returns
+            {"$sort": {"frameIndex": 1, "createdAt": -1}},
+            {"$group": {
+                "_id": "$frameIndex",
+                "messageFrequency": {"$first": "$messageFrequency"},
+                "createdAt": {"$first": "$createdAt"},
+                "tachoMean": {"$first": "$tachoMean"}
+            }},
+            {"$sort": {"_id": 1}},
+            {"$project": {"_id": 0, "frameIndex": "$_id", "messageFrequency": 1, "createdAt": 1, "tachoMean": 1}}
+        ]
+        count = 0
+        try:
+            # Batch sizing is left to the driver
+            for doc in self.history_collection.aggregate(pipeline, allowDiskUse=True):
+                count += 1
+                yield doc
+            logging.debug(f"Retrieved {count} frequency points for {filename} in project {project_name}")
+        except Exception as e:
+            # A stream cut short must not look complete to the caller, which would cache it
+            logging.error(f"Error fetching frequency series after {count} points: {str(e)}")
+            raise
+
+    def get_history_signature(self, project_name, model_name=None, filename=None):
+        query = {"projectName": project_name}
+        if model_name:
+            query["moduleName"] = model_name
+        if filename:
+            query["filename"] = filename
+        query["email"] = self.email
+        try:
+            count = self.history_collection.count_documents(query)
+            last = self.history_collection.find_one(query, {"_id": 0, "frameIndex": 1}, sort=[("frameIndex", -1)])
+            return count, last.get("frameIndex") if last else None
+        except Exception as e:
+            logging.error(f"Error fetching history signature: {str(e)}")
+            return None
+
     def get_distinct_filenames(self, project_name, model_name=None):
         if not self.get_project_data(project_name):
             logging.error(f"Project {project_name} not found!")
@@ -1,6 +1,6 @@
 import numpy as np
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QScrollArea, QPushButton, QCheckBox, QComboBox, QHBoxLayout, QGridLayout, QLabel
-from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QTimer, QElapsedTimer
 from PyQt5.QtGui import QIcon
 import pyqtgraph as pg
 from datetime import datetime
@@ -133,8 +133,10 @@ class TabularViewFeature:
         self.timer.start(1000)
         self.table_initialized = False
         self.data_buffer = []  # Buffer for incoming data
-        self.last_update_time = datetime.now()
-        self.update_interval = 0.5  # Update every 0.5 seconds
+        # Monotonic millisecond clock for throttling; no datetime allocated per incoming frame
+        self.update_elapsed = QElapsedTimer()
+        self.update_elapsed.start()
+        self.update_interval_ms = 500  # Update every 0.5 seconds
         self.initUI()
         self.initialize_thread()
 
@@ -535,10 +537,9 @@ class TabularViewFeature:
             self.log_and_set_status(f"Insufficient data received for frame {frame_index}: {len(values)} channels")
             return
         self.data_buffer.append((values, sample_rate, frame_index))
-        current_time = datetime.now()
-        if (current_time - self.last_update_time).total_seconds() >= self.update_interval:
+        if self.update_elapsed.elapsed() >= self.update_interval_ms:
             self.process_buffered_data()
-            self.last_update_time = current_time
+            self.update_elapsed.restart()
 
     def process_buffered_data(self):
         if not self.data_buffer:
@@ -486,7 +486,8 @@ class TimeReportFeature:
 
     def update_time_labels(self, filename):
         try:
-            messages = self.db.get_history_messages(self.project_name, self.model_name, filename=filename)
+            # Only timestamps and sampling parameters are needed here, not the channel data
+            messages = self.db.get_history_messages(self.project_name, self.model_name, filename=filename, projection={"message": 0}, raw=True)
             if not messages:
                 self.start_time_label.setText("File Start Time: N/A")
                 self.stop_time_label.setText("File Stop Time: N/A")
@@ -494,13 +495,14 @@ class TimeReportFeature:
                 self.end_time_edit.setEnabled(False)
                 return
 
-            # Sort messages by creation time to get accurate start/end
-            sorted_messages = sorted(messages, key=lambda x: datetime.fromisoformat(x['createdAt'].replace('Z', '+00:00')))
-            first_message = sorted_messages[0]
-            last_message = sorted_messages[-1]
+            # Only the earliest and latest messages are needed; each createdAt is parsed once
+            created_at = [datetime.fromisoformat(x['createdAt'].replace('Z', '+00:00')) for x in messages]
+            i_first = min(range(len(created_at)), key=created_at.__getitem__)
+            i_last = max(range(len(created_at)), key=created_at.__getitem__)
+            last_message = messages[i_last]
 
-            first_created_at = datetime.fromisoformat(first_message['createdAt'].replace('Z', '+00:00'))
-            last_created_at = datetime.fromisoformat(last_message['createdAt'].replace('Z', '+00:00'))
+            first_created_at = created_at[i_first]
+            last_created_at = created_at[i_last]
 
             # Duration calculation based on the *last* message's parameters
             sampling_size = last_message.get("samplingSize", 0)
@@ -605,28 +607,17 @@ class TimeReportFeature:
             if self.console:
                 self.console.append_to_console(f"Error initializing plots: {str(e)}")
 
-    def downsample_array(self, data, factor):
+    def downsample_array(self, data, factor, dtype=None):
         if factor <= 1 or len(data) == 0:
             return data
-        # Ensure data is a numpy array for efficient operations
-        data = np.asarray(data)
-        output_length = int(np.ceil(len(data) / factor))
-        # Reshape data to group elements for averaging
-        # Truncate data to make its length divisible by factor
-        truncated_len = (len(data) // factor) * factor
-        if truncated_len == 0:
-            # If not enough data, return the mean
-            return np.array([np.mean(data)]) if len(data) > 0 else np.array([])
-        truncated_data = data[:truncated_len]
-        reshaped_data = truncated_data.reshape(-1, factor)
-        downsampled = np.mean(reshaped_data, axis=1)
-
-        # If there were leftover elements, average them and append
-        if truncated_len < len(data):
-            leftover = data[truncated_len:]
-            downsampled = np.append(downsampled, np.mean(leftover))
-
-        return downsampled
+        # Convert once up front so the reduction runs over contiguous memory; dtype=None keeps the input dtype
+        data = np.asarray(data, dtype=dtype)
+        n = len(data) // factor
+        # Average full groups of `factor` samples in one vectorized reduction
+        head = data[:n * factor].reshape(n, factor).mean(axis=1)
+        # Average any leftover samples into one trailing point
+        tail = data[n * factor:].mean(keepdims=True) if n * factor < len(data) else np.empty(0, dtype=head.dtype)
+        return np.concatenate([head, tail])
 
     def plot_data(self):
         filename = self.selected_filename or self.file_combo.currentText()
@@ -647,7 +638,8 @@ class TimeReportFeature:
             # --- 1. Fetch Data ---
             progress.setLabelText("Fetching data from database...")
             progress.setValue(10)
-            messages = self.db.get_history_messages(self.project_name, self.model_name, filename=filename)
+            # Scan metadata only; payloads are hydrated below for the frames in range
+            messages = self.db.get_history_messages(self.project_name, self.model_name, filename=filename, projection={"message": 0}, sort_by="frameIndex")
             if not messages:
                 raise ValueError(f"No data found for filename {filename}")
 
@@ -655,10 +647,16 @@ class TimeReportFeature:
             progress.setLabelText("Sorting messages...")
             progress.setValue(15)
             try:
-                sorted_messages = sorted(messages, key=lambda x: datetime.fromisoformat(x['createdAt'].replace('Z', '+00:00')))
+                # Parse every createdAt exactly once; sorting and range lookups reuse these timestamps
+                created_at_ts = np.array([datetime.fromisoformat(x['createdAt'].replace('Z', '+00:00')).timestamp() for x in messages], dtype=np.float64)
             except (ValueError, KeyError) as sort_error:
                 logging.error(f"Error sorting messages by 'createdAt': {sort_error}")
                 raise ValueError(f"Could not sort messages by timestamp: {sort_error}")
+            order = np.argsort(created_at_ts, kind='stable')
+            created_at_ts = created_at_ts[order]
+            # Messages starting after the selected end time cannot overlap it, so they are never visited
+            in_range_end = int(np.searchsorted(created_at_ts, self.end_time, side='right')) if self.end_time is not None else len(created_at_ts)
+            sorted_messages = [messages[i] for i in order[:in_range_end]]
 
             progress.setLabelText("Filtering messages by time range and validating data...")
             progress.setValue(20)
@@ -666,14 +664,11 @@ class TimeReportFeature:
             # and whose *end time* (createdAt + duration) is after the selected start_time.
             # This ensures we get messages that overlap with the selected range.
             filtered_messages = []
-            for msg in sorted_messages:
+            for msg, msg_created_at_ts in zip(sorted_messages, created_at_ts[:in_range_end].tolist()):
                  try:
-                     msg_created_at_dt = datetime.fromisoformat(msg['createdAt'].replace('Z', '+00:00'))
-                     msg_created_at_ts = msg_created_at_dt.timestamp()
                      # --- CRITICAL: Strict Validation of samplingSize and samplingRate ---
                      sampling_size_raw = msg.get("samplingSize")
                      sampling_rate_raw = msg.get("samplingRate")
-                     message_data_raw = msg.get("message")
 
                      # Check 1: Is the field present and not None?
                      if sampling_size_raw is None:
@@ -716,11 +711,6 @@ class TimeReportFeature:
                          logging.warning(f"Skipping message (FrameIndex: {msg.get('frameIndex', 'N/A')}): 'samplingRate' is not positive ({sampling_rate_raw})")
                          continue
 
-                     # Check 4: Is message data present?
-                     if message_data_raw is None or not isinstance(message_data_raw, (list, np.ndarray)):
-                          logging.warning(f"Skipping message (FrameIndex: {msg.get('frameIndex', 'N/A')}): Invalid or missing 'message' data")
-                          continue
-
                      duration = sampling_size_raw / sampling_rate_raw
                      msg_end_time_ts = msg_created_at_ts + duration
 
@@ -730,12 +720,30 @@ class TimeReportFeature:
                          # Store the validated values to avoid .get() later
                          msg['_validated_samplingSize'] = sampling_size_raw
                          msg['_validated_samplingRate'] = sampling_rate_raw
+                         msg['_created_at_ts'] = msg_created_at_ts
                          filtered_messages.append(msg)
                      # --- END CRITICAL VALIDATION ---
                  except (ValueError, TypeError, KeyError) as e:
                      logging.warning(f"Skipping message due to error parsing fields: {e}")
                      continue
 
+            # Hydrate the payloads of the in-range frames with a single bulk query
+            progress.setLabelText("Fetching message data for the selected range...")
+            payloads = self.db.get_messages_bulk(self.project_name, self.model_name, filename=filename,
+                                                 ids=[msg["_id"] for msg in filtered_messages])
+            if payloads is None:
+                raise RuntimeError(f"Could not fetch message data for filename {filename} from the database")
+            hydrated_messages = []
+            for msg in filtered_messages:
+                 # Check 4: Is message data present?
+                 message_data_raw = payloads.get(msg["_id"])
+                 if message_data_raw is None or not isinstance(message_data_raw, (list, np.ndarray)):
+                      logging.warning(f"Skipping message (FrameIndex: {msg.get('frameIndex', 'N/A')}): Invalid or missing 'message' data")
+                      continue
+                 msg["message"] = message_data_raw
+                 hydrated_messages.append(msg)
+            filtered_messages = hydrated_messages
+
             if not filtered_messages:
                 error_msg = (f"No valid data messages found within the selected time range for filename {filename}. "
                              f"Check database for correct 'samplingSize' (must be positive int), "
@@ -817,8 +825,7 @@ class TimeReportFeature:
                                     f"Expected (validated) {expected_len_for_this_msg}, got {len(flattened_data)}")
                     continue # Skip this message, continue with others
 
-                msg_created_at_dt = datetime.fromisoformat(msg['createdAt'].replace('Z', '+00:00'))
-                msg_created_at_ts = msg_created_at_dt.timestamp()
+                msg_created_at_ts = msg['_created_at_ts']
                 # --- END CRITICAL VALIDATION ---
 
                 # --- Unflatten and Process ---
@@ -917,7 +924,7 @@ class TimeReportFeature:
                 # --- END CORRECTED UNIT CONVERSION ---
 
                 if needs_downsampling and len(calibrated_data) > 0:
-                    calibrated_data = self.downsample_array(calibrated_data, downsample_factor)
+                    calibrated_data = self.downsample_array(calibrated_data, downsample_factor, dtype=np.float32)
                 processed_data.append(calibrated_data)
 
             # Handle Tacho Channels (No calibration, potentially scaling if needed, but C# doesn't)
@@ -929,11 +936,12 @@ class TimeReportFeature:
                  # Let's remove arbitrary scaling and match C#.
                  processed_tacho_data = tacho_data # Raw tacho data
                  if needs_downsampling and len(processed_tacho_data) > 0:
-                     processed_tacho_data = self.downsample_array(processed_tacho_data, downsample_factor)
+                     processed_tacho_data = self.downsample_array(processed_tacho_data, downsample_factor, dtype=np.float32)
                  processed_data.append(processed_tacho_data)
 
             # Downsample times if needed
             if needs_downsampling and len(filtered_times) > 0:
+                # Kept in their own float64: float32 would round epoch timestamps to minutes
                 filtered_times = self.downsample_array(filtered_times, downsample_factor)
 
             # --- 8. Plotting ---
@@ -502,12 +502,12 @@ class TimeViewFeature:
     def load_file(self, filename):
         """Existing loader: kept intact to support 'Open saved files' flow."""
         try:
-            messages = self.db.get_history_messages(self.project_name, self.model_name, filename=filename)
-            if not messages:
+            # Only the most recent frame is shown, so only that document is fetched
+            message = self.db.get_latest_history_message(self.project_name, self.model_name, filename=filename)
+            if not message:
                 self.log_and_set_status(f"No data found for filename {filename}")
                 return
 
-            message = messages[-1]
             main_channels = message.get("numberOfChannels", 0)
             tacho_channels = message.get("tacoChannelCount", 0)
             samples_per_channel = message.get("samplingSize", 0)
@@ -515,7 +515,7 @@ class TimeViewFeature:
             frame_index = message.get("frameIndex", 0)
             flattened_data = message.get("message", [])
 
-            if not flattened_data or not sample_rate or not samples_per_channel:
+            if flattened_data is None or len(flattened_data) == 0 or not sample_rate or not samples_per_channel:
                 self.log_and_set_status(f"Invalid data in file {filename}")
                 return
 
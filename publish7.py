@@ -329,6 +329,7 @@ class FrequencyPlot(QWidget):
                 full_record = list(full_records)
                 if full_record:
                     closest_record = full_record[0]
+                    closest_record["message"] = self.db.decode_message_list(closest_record)
             return closest_record
         except Exception as e:
             logging.error(f"Error finding closest record: {str(e)}")